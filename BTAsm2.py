@@ -1,39 +1,103 @@
 # --- Standard Library Imports ---
 import hashlib  # To create secure one-way hashes (e.g., SHA-256 for block and transaction hashes)
-import json     # For serializing Python dictionaries into a JSON string format(essential for consistent hashing)
-import time     # Provides time-related functions
+import time     # Provides time-related functions (integer nanosecond timestamps for transactions and blocks)
 import os       # For file and directory management (e.g., creating a directory for the blockchain data)
-import glob     # Finds all the file pathnames matching a specified pattern, used here to load all saved block files
-import pickle   # A module for serializing and deserializing Python objects (To save and load entire block objects to and from files)
-from datetime import datetime  
+import mmap     # Memory-maps the block log so saved blocks are decoded in place when the chain is loaded
+import struct   # Packs numbers into fixed-width big-endian bytes for the canonical hashing layout
+from functools import lru_cache # Memoizes parsed public keys across signature verifications
+from datetime import datetime  # Formats timestamps for display only
 from uuid import uuid4       # Generates a random, universally unique identifier (UUID) for transactions, ensuring each one has a unique ID
 
 # --- Third-Party Cryptographic Library ---
-import ecdsa #for the security of digital signatures in transactions
+import coincurve #libsecp256k1 bindings for the security of digital signatures in transactions
 #(Ensures that only the rightful owner of a private key can authorize a transaction)
 
+# --- Optional JIT Compiler ---
+try:
+    import numpy as np  # SHA-256 state and message blocks of the compiled kernels (installed with numba)
+    from numba import njit, prange, get_num_threads  # Compiles the Proof-of-Work nonce search to native, multi-threaded code
+    NUMBA_AVAILABLE = True
+except ImportError:           # Mining falls back to the pure-Python hashlib loop
+    NUMBA_AVAILABLE = False
+
+CUDA_AVAILABLE = False
+if NUMBA_AVAILABLE:
+    try:
+        from numba import cuda    # Offloads high-difficulty nonce grinding to an NVIDIA GPU
+        CUDA_AVAILABLE = cuda.is_available()
+    except Exception:         # No CUDA toolkit/driver installed, or the CUDA target failed to initialise
+        CUDA_AVAILABLE = False
+
 # --- Cryptographic Utilities ---
 
+# hashlib.sha256 is OpenSSL's EVP SHA-256, which dispatches to SHA-NI at runtime when the CPU supports it
+_sha256 = hashlib.sha256
+
+def fast_sha256(data): #Returns the raw SHA-256 digest of a bytes object in a single call
+    return _sha256(data).digest()
+
+MERKLE_BATCH_MIN_LEAVES = 64  # From this many leaves the batched multi-lane kernel beats hashing node pairs one at a time
+
+def merkle_root(leaf_hashes): #Computes the Merkle root of a list of 32-byte digests by pairwise SHA-256 hashing, duplicating the last node of odd-sized levels
+    if not leaf_hashes:
+        return b'\x00' * 32  # A block with no transactions commits to an all-zero root
+    if NUMBA_AVAILABLE and len(leaf_hashes) >= MERKLE_BATCH_MIN_LEAVES:
+        # Level-order construction: every sibling pair on a level is hashed in one batched kernel call
+        level = np.frombuffer(b''.join(leaf_hashes), dtype=np.uint8).reshape(-1, 32)
+        while level.shape[0] > 1:
+            if level.shape[0] % 2:
+                level = np.vstack((level, level[-1:]))
+            level = _hash_node_pairs(level)
+        return level[0].tobytes()
+    level = list(leaf_hashes)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [fast_sha256(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0]
+
+def format_timestamp(timestamp_ns): #Formats an integer nanosecond timestamp as a human-readable local date and time
+    return datetime.fromtimestamp(timestamp_ns / 1e9).strftime("%Y-%m-%d %H:%M:%S")
+
+def length_prefixed(data): #Encodes a variable-length bytes field as a 4-byte big-endian length followed by the data, so adjacent fields can't run together
+    return struct.pack('>I', len(data)) + data
+
+def read_length_prefixed(buf, offset): #Reads a field written by length_prefixed, returning the data and the offset just past it
+    (length,) = struct.unpack_from('>I', buf, offset)
+    start = offset + 4
+    if start + length > len(buf): # A truncated buffer would otherwise yield a silently shortened field
+        raise ValueError(f"Field at offset {offset} runs past the end of the buffer")
+    return bytes(buf[start:start + length]), start + length
+
 class Wallet: #Manages public/private key pairs for users
     
     def __init__(self):
-        self.private_key = ecdsa.SigningKey.generate(curve=ecdsa.SECP256k1)
-        self.public_key = self.private_key.get_verifying_key()
-        self.address = self.public_key.to_string().hex()
+        self.private_key = coincurve.PrivateKey()
+        self.public_key = self.private_key.public_key
+        # The address is the raw 64-byte (x, y) public key as bytes, without the 0x04 uncompressed-point prefix (hex-encoded only for display)
+        self.address = self.public_key.format(compressed=False)[1:]
 
-    def sign_transaction(self, transaction_data):  #Signs a transaction with the wallet's private key
-        return self.private_key.sign(transaction_data.encode()).hex()
+    def sign_bytes(self, message):  #Signs a message (a transaction's signing payload) with the wallet's private key (deterministic ECDSA)
+        return self.private_key.sign(message).hex()
 
-    def verify_signature(self, public_key, signature, transaction_data): #Verifies a transaction's signature using the sender's public key
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def load_public_key(public_key): #Parses an address into a libsecp256k1 public key; cached, since a sender's key is verified against for every transaction they send
+        return coincurve.PublicKey(b'\x04' + public_key)
+
+    @staticmethod
+    def verify_signature(public_key, signature, message): #Verifies a signature over message bytes using the sender's public key (needs no wallet instance)
 
         try:
-            vk = ecdsa.VerifyingKey.from_string(bytes.fromhex(public_key), curve=ecdsa.SECP256k1)
-            return vk.verify(bytes.fromhex(signature), transaction_data.encode())
-        except ecdsa.BadSignatureError:
+            pk = Wallet.load_public_key(public_key)
+            return pk.verify(bytes.fromhex(signature), message)
+        except (ValueError, TypeError): # Malformed key or signature
             return False
 
 # --- Transaction and UTXO Management ---
 
+COINBASE_SENDER = b'blockchain_reward'  # Sender address of the unsigned coinbase transaction that rewards the miner
+
 class Transaction: #Represents a transaction in the blockchain, uses existing UTXOs as inputs to fund the transfer
 
     def __init__(self, sender_address, recipient_address, amount, input_utxos=None):
@@ -49,13 +113,36 @@ class Transaction: #Represents a transaction in the blockchain, uses existing UT
         self.input_utxos = input_utxos or [] 
         # The cryptographic signature of the transaction, created by the sender's private key
         self.signature = None
-        # Timestamps the transaction with the current date and time
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Timestamps the transaction with the current time, in integer nanoseconds since the epoch
+        self.timestamp = time.time_ns()
+        # Memoized serialized forms, cleared by __setattr__ whenever a hashed field is reassigned
+        self._cached_canonical = None
+        self._cached_digest = None
+        self._cached_payload = None
+
+    # Fields covered by the signing payload and canonical bytes
+    HASHED_FIELDS = frozenset({'id', 'sender_address', 'recipient_address', 'amount', 'timestamp', 'input_utxos', 'signature'})
+
+    def __setattr__(self, name, value): #Sets an attribute, dropping the memoized serialized forms if it is one of the hashed fields
+        super().__setattr__(name, value)
+        if name in Transaction.HASHED_FIELDS:
+            self.__dict__['_cached_canonical'] = None
+            self.__dict__['_cached_digest'] = None
+            if name != 'signature': # The signing payload excludes the signature
+                self.__dict__['_cached_payload'] = None
+
+    def timestamp_str(self): #Returns the transaction's timestamp formatted for display
+        return format_timestamp(self.timestamp)
 
     def __repr__(self): #Returns a concise, human-readable representation of the transaction
-        return f"Transaction(ID: {self.id}, From: {self.sender_address[:8]}..., To: {self.recipient_address[:8]}..., Amount: {self.amount})"
+        # The coinbase sender is a readable marker rather than a key, so it is shown decoded instead of hex-encoded
+        sender = self.sender_address.decode() if self.sender_address == COINBASE_SENDER else self.sender_address.hex()
+        return f"Transaction(ID: {self.id}, From: {sender[:8]}..., To: {self.recipient_address.hex()[:8]}..., Amount: {self.amount})"
+
+    def set_signature(self, signature): #Sets the transaction's signature (the assignment invalidates the cached serialized forms)
+        self.signature = signature
 
-    def to_dict(self): #Converts the transaction object to a dictionary for JSON serialization, important for for creating a consistent hash of the transaction data
+    def to_dict(self): #Converts the transaction object to a dictionary for serialization
         return {
             'tx_id': self.id,
             'sender_address': self.sender_address,
@@ -67,11 +154,66 @@ class Transaction: #Represents a transaction in the blockchain, uses existing UT
             'signature': self.signature
         }
 
-    def get_hash(self): #Generates a SHA-256 hash of the transaction data
+    def build_signing_payload(self): #Serializes the bytes the sender signs from the current fields: every field except the signature, in a fixed order
+        # The field order is fixed here, so the layout is canonical without sorting keys
+        fields = [
+            length_prefixed(self.id.encode()),
+            length_prefixed(self.sender_address),
+            length_prefixed(self.recipient_address),
+            struct.pack('>dQI', self.amount, self.timestamp, len(self.input_utxos)),
+        ]
+        for utxo_in in self.input_utxos:
+            fields.append(length_prefixed(utxo_in['tx_id'].encode()))
+            fields.append(struct.pack('>Id', utxo_in['output_index'], utxo_in['amount']))
+            fields.append(length_prefixed(utxo_in['recipient_address']))
+        return b''.join(fields)
+
+    def signing_payload(self): #Returns the signing payload, cached after the first call (used when signing and hashing)
+        if self._cached_payload is None:
+            self._cached_payload = self.build_signing_payload()
+        return self._cached_payload
+
+    def canonical_bytes(self): #Returns the deterministic byte layout of the transaction used for hashing (signing payload + signature), cached after the first call
+        if self._cached_canonical is None:
+            self._cached_canonical = self.signing_payload() + length_prefixed((self.signature or '').encode())
+        return self._cached_canonical
+
+    @classmethod
+    def from_canonical_bytes(cls, data): #Rebuilds a transaction from the layout produced by canonical_bytes() (used when loading blocks from disk)
+        tx_id, offset = read_length_prefixed(data, 0)
+        sender_address, offset = read_length_prefixed(data, offset)
+        recipient_address, offset = read_length_prefixed(data, offset)
+        amount, timestamp, input_count = struct.unpack_from('>dQI', data, offset)
+        offset += 20
+        input_utxos = []
+        for _ in range(input_count):
+            utxo_tx_id, offset = read_length_prefixed(data, offset)
+            output_index, utxo_amount = struct.unpack_from('>Id', data, offset)
+            utxo_recipient, offset = read_length_prefixed(data, offset + 12)
+            input_utxos.append({
+                "tx_id": utxo_tx_id.decode(),
+                "output_index": output_index,
+                "amount": utxo_amount,
+                "recipient_address": utxo_recipient
+            })
+        signature, offset = read_length_prefixed(data, offset)
 
-        transaction_data_str = json.dumps(self.to_dict(), sort_keys=True) #Ensures the data is always in the same order to  produce a consistent hash
-        # The data is encoded to bytes before being hashed, as required by the `hashlib` library
-        return hashlib.sha256(transaction_data_str.encode()).hexdigest()
+        transaction = cls(sender_address, recipient_address, amount, input_utxos)
+        transaction.id = tx_id.decode()
+        transaction.timestamp = timestamp
+        transaction.set_signature(signature.decode() or None) # An unsigned (coinbase) transaction is stored with an empty signature
+        return transaction
+
+    def calculate_digest(self): #Calculates the raw SHA-256 digest from freshly serialized fields, bypassing every cache (used by validation)
+        return fast_sha256(self.build_signing_payload() + length_prefixed((self.signature or '').encode()))
+
+    def get_digest(self): #Generates the raw SHA-256 digest of the transaction data, cached alongside the canonical bytes
+        if self._cached_digest is None:
+            self._cached_digest = fast_sha256(self.canonical_bytes())
+        return self._cached_digest
+
+    def get_hash(self): #Generates a SHA-256 hash of the transaction data as a hex string
+        return self.get_digest().hex()
 
 class UTXO: #Represents an unspent transaction output. UTXO is a record of value that an address can spend (fundamental unit of value in this blockchain model)
     
@@ -89,57 +231,463 @@ class UTXO: #Represents an unspent transaction output. UTXO is a record of value
             "recipient_address": self.recipient_address
         }
 
+    def get_digest(self): #Generates the SHA-256 digest of the UTXO's fields, which is what the UTXO-set commitment accumulates
+        return fast_sha256(length_prefixed(self.tx_id.encode()) + struct.pack('>Id', self.output_index, self.amount)
+                           + length_prefixed(self.recipient_address))
+
     def __repr__(self):  #Returns a concise, human-readable representation of the UTXO
         return f"UTXO(tx_id: {self.tx_id[:8]}..., amount: {self.amount})"
 
 
+# --- Proof-of-Work Nonce Search ---
+
+NONCE_CHUNK_SIZE = 1 << 20  # Nonces tried per thread per call into the compiled kernel before returning to Python
+THREAD_ROUND_SIZE = 4096    # Consecutive nonces each thread hashes per round of the parallel search; small, so a hit wastes at most one round
+GPU_MIN_DIFFICULTY = 5      # Below this the kernel-launch overhead outweighs the GPU's hashing throughput
+CUDA_BLOCKS_PER_GRID = 65536
+CUDA_THREADS_PER_BLOCK = 256
+SIMD_LANES = 8              # Nonces hashed side by side on the CPU: eight 32-bit lanes fill one AVX2 register
+
+if NUMBA_AVAILABLE:
+    # SHA-256 round constants and initial hash values (FIPS 180-4), held as int64 so 32-bit sums never overflow
+    _SHA256_K = np.array([
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+    ], dtype=np.int64)
+    _SHA256_H0 = np.array([
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+    ], dtype=np.int64)
+
+    def _padding_block_round_constants(message_length): #Expands the schedule of the padding-only final block of a message_length-byte message, folded into K[t] + W[t]
+        # Only valid when message_length is a multiple of 64, so the padding fills a block of its own
+        block = b'\x80' + b'\x00' * 55 + struct.pack('>Q', message_length * 8)
+        w = list(struct.unpack('>16I', block))
+        rotr = lambda x, n: ((x >> n) | (x << (32 - n))) & 0xFFFFFFFF
+        for t in range(16, 64):
+            s0 = rotr(w[t - 15], 7) ^ rotr(w[t - 15], 18) ^ (w[t - 15] >> 3)
+            s1 = rotr(w[t - 2], 17) ^ rotr(w[t - 2], 19) ^ (w[t - 2] >> 10)
+            w.append((w[t - 16] + s0 + w[t - 7] + s1) & 0xFFFFFFFF)
+        return np.array([(int(k) + w_t) & 0xFFFFFFFF for k, w_t in zip(_SHA256_K, w)], dtype=np.int64)
+
+    # Merkle node messages are always two 32-byte digests, so their second block's schedule is a compile-time constant
+    _SHA256_64B_PADDING_KW = _padding_block_round_constants(64)
+
+    @njit(cache=True)
+    def _rotr(x, n): #Rotates a 32-bit word right by n bits
+        return ((x >> n) | (x << (32 - n))) & 0xFFFFFFFF
+
+    @njit(cache=True)
+    def _sha256_compress(state, data, offset, w): #Runs one SHA-256 compression of the 64-byte block at data[offset:] into state, using w as the 64-word schedule buffer
+        for t in range(16):
+            i = offset + 4 * t
+            w[t] = (np.int64(data[i]) << 24) | (np.int64(data[i + 1]) << 16) | (np.int64(data[i + 2]) << 8) | np.int64(data[i + 3])
+        for t in range(16, 64):
+            s0 = _rotr(w[t - 15], 7) ^ _rotr(w[t - 15], 18) ^ (w[t - 15] >> 3)
+            s1 = _rotr(w[t - 2], 17) ^ _rotr(w[t - 2], 19) ^ (w[t - 2] >> 10)
+            w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & 0xFFFFFFFF
+
+        a, b, c, d, e, f, g, h = state[0], state[1], state[2], state[3], state[4], state[5], state[6], state[7]
+        for t in range(64):
+            t1 = (h + (_rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)) + ((e & f) ^ (~e & g)) + _SHA256_K[t] + w[t]) & 0xFFFFFFFF
+            t2 = ((_rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)) + ((a & b) ^ (a & c) ^ (b & c))) & 0xFFFFFFFF
+            h, g, f, e, d, c, b, a = g, f, e, (d + t1) & 0xFFFFFFFF, c, b, a, (t1 + t2) & 0xFFFFFFFF
+
+        state[0] = (state[0] + a) & 0xFFFFFFFF
+        state[1] = (state[1] + b) & 0xFFFFFFFF
+        state[2] = (state[2] + c) & 0xFFFFFFFF
+        state[3] = (state[3] + d) & 0xFFFFFFFF
+        state[4] = (state[4] + e) & 0xFFFFFFFF
+        state[5] = (state[5] + f) & 0xFFFFFFFF
+        state[6] = (state[6] + g) & 0xFFFFFFFF
+        state[7] = (state[7] + h) & 0xFFFFFFFF
+
+    @njit(cache=True)
+    def _sha256_midstate(prefix): #Compresses every complete 64-byte block of the prefix, returning the intermediate state
+        state = _SHA256_H0.copy()
+        w = np.empty(64, np.int64)
+        for offset in range(0, prefix.shape[0] - prefix.shape[0] % 64, 64):
+            _sha256_compress(state, prefix, offset, w)
+        return state
+
+    @njit(cache=True)
+    def _write_nonce_suffix(buf, tail_len, prefix_len, nonce): #Writes the ASCII nonce and SHA-256 padding after the buffered prefix tail, returning the padded length (64 or 128)
+        # Writes the nonce's decimal digits straight after the buffered prefix tail
+        digit_count = 1
+        n = nonce // 10
+        while n > 0:
+            digit_count += 1
+            n //= 10
+        n = nonce
+        for k in range(digit_count - 1, -1, -1):
+            buf[tail_len + k] = 48 + n % 10
+            n //= 10
+
+        # Appends SHA-256 padding: 0x80, zeros, then the 64-bit big-endian message length in bits
+        message_end = tail_len + digit_count
+        block_end = 64 if message_end + 9 <= 64 else 128
+        buf[message_end] = 0x80
+        for k in range(message_end + 1, block_end - 8):
+            buf[k] = 0
+        bit_length = (prefix_len + digit_count) * 8
+        for k in range(8):
+            buf[block_end - 1 - k] = (bit_length >> (8 * k)) & 0xFF
+        return block_end
+
+    @njit(cache=True)
+    def _nonce_meets_difficulty(midstate, buf, tail_len, prefix_len, difficulty, nonce, state, w): #Hashes prefix + ASCII nonce from the midstate and checks the leading zero nibbles
+        block_end = _write_nonce_suffix(buf, tail_len, prefix_len, nonce)
+        for i in range(8):
+            state[i] = midstate[i]
+        _sha256_compress(state, buf, 0, w)
+        if block_end == 128:
+            _sha256_compress(state, buf, 64, w)
+
+        for i in range(difficulty): # Each state word holds eight hex nibbles of the digest
+            if (state[i >> 3] >> (28 - 4 * (i & 7))) & 0xF:
+                return False
+        return True
+
+    @njit(cache=True)
+    def _sha256_compress_lanes(state, data, offset, w, v): #Compresses SIMD_LANES independent 64-byte blocks at data[lane, offset:] in lockstep
+        # state/v are (8, lanes) and w is (64, lanes) uint32 arrays; every inner loop runs across lanes, so LLVM vectorizes it (one lane per 32-bit SIMD element)
+        # Intermediate values may carry bits above 32, which are discarded when stored back into the uint32 arrays
+        # The lane count is read from the array shape: a runtime trip count is vectorized, whereas a constant 8 is merely unrolled
+        lanes = state.shape[1]
+        for t in range(16):
+            i = offset + 4 * t
+            for lane in range(lanes):
+                w[t, lane] = (np.uint32(data[lane, i]) << 24) | (np.uint32(data[lane, i + 1]) << 16) | (np.uint32(data[lane, i + 2]) << 8) | np.uint32(data[lane, i + 3])
+        for t in range(16, 64):
+            for lane in range(lanes):
+                x = w[t - 15, lane]
+                y = w[t - 2, lane]
+                s0 = ((x >> 7) | (x << 25)) ^ ((x >> 18) | (x << 14)) ^ (x >> 3)
+                s1 = ((y >> 17) | (y << 15)) ^ ((y >> 19) | (y << 13)) ^ (y >> 10)
+                w[t, lane] = w[t - 16, lane] + s0 + w[t - 7, lane] + s1
+
+        for j in range(8):
+            for lane in range(lanes):
+                v[j, lane] = state[j, lane]
+        for t in range(64):
+            k = _SHA256_K[t]
+            for lane in range(lanes):
+                a = v[0, lane]
+                b = v[1, lane]
+                c = v[2, lane]
+                d = v[3, lane]
+                e = v[4, lane]
+                f = v[5, lane]
+                g = v[6, lane]
+                h = v[7, lane]
+                t1 = h + (((e >> 6) | (e << 26)) ^ ((e >> 11) | (e << 21)) ^ ((e >> 25) | (e << 7))) + ((e & f) ^ (~e & g)) + k + w[t, lane]
+                t2 = (((a >> 2) | (a << 30)) ^ ((a >> 13) | (a << 19)) ^ ((a >> 22) | (a << 10))) + ((a & b) ^ (a & c) ^ (b & c))
+                v[7, lane] = g
+                v[6, lane] = f
+                v[5, lane] = e
+                v[4, lane] = d + t1
+                v[3, lane] = c
+                v[2, lane] = b
+                v[1, lane] = a
+                v[0, lane] = t1 + t2
+        for j in range(8):
+            for lane in range(lanes):
+                state[j, lane] += v[j, lane]
+
+    @njit(cache=True)
+    def _sha256_compress_lanes_64b_padding(state, v): #Compresses the fixed padding block of a 64-byte message into every lane, using the baked-in schedule
+        # Same rounds as _sha256_compress_lanes, minus the message loads and schedule expansion
+        lanes = state.shape[1]
+        for j in range(8):
+            for lane in range(lanes):
+                v[j, lane] = state[j, lane]
+        for t in range(64):
+            kw = _SHA256_64B_PADDING_KW[t]
+            for lane in range(lanes):
+                a = v[0, lane]
+                b = v[1, lane]
+                c = v[2, lane]
+                d = v[3, lane]
+                e = v[4, lane]
+                f = v[5, lane]
+                g = v[6, lane]
+                h = v[7, lane]
+                t1 = h + (((e >> 6) | (e << 26)) ^ ((e >> 11) | (e << 21)) ^ ((e >> 25) | (e << 7))) + ((e & f) ^ (~e & g)) + kw
+                t2 = (((a >> 2) | (a << 30)) ^ ((a >> 13) | (a << 19)) ^ ((a >> 22) | (a << 10))) + ((a & b) ^ (a & c) ^ (b & c))
+                v[7, lane] = g
+                v[6, lane] = f
+                v[5, lane] = e
+                v[4, lane] = d + t1
+                v[3, lane] = c
+                v[2, lane] = b
+                v[1, lane] = a
+                v[0, lane] = t1 + t2
+        for j in range(8):
+            for lane in range(lanes):
+                state[j, lane] += v[j, lane]
+
+    @njit(cache=True)
+    def _search_nonce_range(midstate, tail, prefix_len, difficulty, start, count): #Returns the first valid nonce in [start, start + count), or -1, hashing SIMD_LANES consecutive nonces per step
+        tail_len = tail.shape[0]
+        bufs = np.zeros((SIMD_LANES, 128), np.uint8)
+        for lane in range(SIMD_LANES):
+            bufs[lane, :tail_len] = tail
+        state = np.empty((8, SIMD_LANES), np.uint32)
+        first_block_state = np.empty((8, SIMD_LANES), np.uint32)
+        w = np.empty((64, SIMD_LANES), np.uint32)
+        v = np.empty((8, SIMD_LANES), np.uint32)
+        block_ends = np.empty(SIMD_LANES, np.int64)
+        end = start + count
+        for base in range(start, end, SIMD_LANES):
+            two_blocks = False
+            for lane in range(SIMD_LANES):
+                block_ends[lane] = _write_nonce_suffix(bufs[lane], tail_len, prefix_len, base + lane)
+                two_blocks = two_blocks or block_ends[lane] == 128
+                for i in range(8):
+                    state[i, lane] = midstate[i]
+            _sha256_compress_lanes(state, bufs, 0, w, v)
+            if two_blocks:
+                # Nonce digit counts can differ across lanes, so keep the result for lanes already finished after one block
+                first_block_state[:, :] = state
+                _sha256_compress_lanes(state, bufs, 64, w, v)
+
+            # Lanes are in nonce order; the first lane meeting the target is the lowest valid nonce
+            for lane in range(min(SIMD_LANES, end - base)):
+                digest = state if block_ends[lane] == 128 or not two_blocks else first_block_state
+                meets = True
+                for i in range(difficulty): # Each state word holds eight hex nibbles of the digest
+                    if (digest[i >> 3, lane] >> (28 - 4 * (i & 7))) & 0xF:
+                        meets = False
+                        break
+                if meets:
+                    return base + lane
+        return -1
+
+    @njit(cache=True)
+    def _hash_node_pairs(nodes): #Hashes each sibling pair of an (2m, 32) uint8 array of Merkle nodes, SIMD_LANES pairs at a time, returning the (m, 32) parent level
+        pair_count = nodes.shape[0] // 2
+        parents = np.empty((pair_count, 32), np.uint8)
+        bufs = np.empty((SIMD_LANES, 64), np.uint8)
+        state = np.empty((8, SIMD_LANES), np.uint32)
+        w = np.empty((64, SIMD_LANES), np.uint32)
+        v = np.empty((8, SIMD_LANES), np.uint32)
+        for base in range(0, pair_count, SIMD_LANES):
+            for lane in range(SIMD_LANES):
+                pair = min(base + lane, pair_count - 1) # Spare lanes in the last batch rehash the final pair and are ignored
+                bufs[lane, :32] = nodes[2 * pair]
+                bufs[lane, 32:64] = nodes[2 * pair + 1]
+                for i in range(8):
+                    state[i, lane] = _SHA256_H0[i]
+            _sha256_compress_lanes(state, bufs, 0, w, v)
+            # Every message is exactly 64 bytes, so the second block is always the same padding
+            _sha256_compress_lanes_64b_padding(state, v)
+            for lane in range(min(SIMD_LANES, pair_count - base)):
+                for i in range(8): # Writes each state word out big-endian
+                    word = state[i, lane]
+                    parents[base + lane, 4 * i] = (word >> 24) & 0xFF
+                    parents[base + lane, 4 * i + 1] = (word >> 16) & 0xFF
+                    parents[base + lane, 4 * i + 2] = (word >> 8) & 0xFF
+                    parents[base + lane, 4 * i + 3] = word & 0xFF
+        return parents
+
+    @njit(parallel=True, cache=True)
+    def _search_nonce_range_parallel(midstate, tail, prefix_len, difficulty, start, count, lanes): #Searches [start, start + count) in rounds, each thread taking the next THREAD_ROUND_SIZE nonces per round
+        # Rounds tile the range in nonce order, so the first round with a hit holds the lowest valid nonce,
+        # and every round before it keeps all threads busy on disjoint nonces
+        results = np.empty(lanes, np.int64)
+        end = start + count
+        for round_start in range(start, end, THREAD_ROUND_SIZE * lanes):
+            for lane in prange(lanes):
+                lane_start = round_start + lane * THREAD_ROUND_SIZE
+                lane_count = min(THREAD_ROUND_SIZE, end - lane_start)
+                if lane_count > 0:
+                    results[lane] = _search_nonce_range(midstate, tail, prefix_len, difficulty, lane_start, lane_count)
+                else:
+                    results[lane] = -1
+            # Lanes are in nonce order within a round, so the first lane with a hit holds the lowest valid nonce
+            for lane in range(lanes):
+                if results[lane] >= 0:
+                    return results[lane]
+        return -1
+
+if CUDA_AVAILABLE:
+    _NO_NONCE = np.iinfo(np.int64).max  # Sentinel left in the output slot when no thread found a valid nonce
+
+    @cuda.jit
+    def _mine_kernel(midstate, tail, prefix_len, difficulty, base_nonce, out_nonce): #Each GPU thread hashes one nonce; hits are atomically min-reduced into out_nonce[0]
+        # The jitted SHA-256 helpers above are compiled again as device functions, working on per-thread local buffers
+        buf = cuda.local.array(128, np.uint8)
+        state = cuda.local.array(8, np.int64)
+        w = cuda.local.array(64, np.int64)
+        for k in range(tail.shape[0]):
+            buf[k] = tail[k]
+        nonce = base_nonce + cuda.grid(1)
+        if _nonce_meets_difficulty(midstate, buf, tail.shape[0], prefix_len, difficulty, nonce, state, w):
+            cuda.atomic.min(out_nonce, 0, nonce)
+
+    def _find_nonce_cuda(midstate, tail, prefix_len, difficulty, start_nonce): #Launches grids of nonces from start_nonce until one contains a valid nonce
+        grid_size = CUDA_BLOCKS_PER_GRID * CUDA_THREADS_PER_BLOCK
+        d_midstate = cuda.to_device(midstate)
+        d_tail = cuda.to_device(tail)
+        d_out = cuda.to_device(np.array([_NO_NONCE], dtype=np.int64))
+        base_nonce = start_nonce
+        while True:
+            _mine_kernel[CUDA_BLOCKS_PER_GRID, CUDA_THREADS_PER_BLOCK](d_midstate, d_tail, prefix_len, difficulty, base_nonce, d_out)
+            found = d_out.copy_to_host()[0]
+            if found != _NO_NONCE:
+                return int(found)
+            base_nonce += grid_size
+
+def find_nonce(prefix, difficulty, start_nonce=0): #Returns the first nonce >= start_nonce for which SHA-256(prefix + ASCII nonce) has `difficulty` leading hex zeros
+    global CUDA_AVAILABLE
+    if NUMBA_AVAILABLE:
+        # The prefix never changes, so its complete 64-byte blocks are compressed once up front
+        data = np.frombuffer(prefix, dtype=np.uint8)
+        midstate = _sha256_midstate(data)
+        tail = data[len(prefix) - len(prefix) % 64:].copy()
+        if CUDA_AVAILABLE and difficulty >= GPU_MIN_DIFFICULTY:
+            try:
+                return _find_nonce_cuda(midstate, tail, len(prefix), difficulty, start_nonce)
+            except Exception as e: # Kernel compile or launch failed: disables the GPU path and falls back to the CPU search
+                print(f"⚠️ GPU mining failed ({e}); falling back to the CPU.")
+                CUDA_AVAILABLE = False
+        lanes = get_num_threads()
+        nonce = start_nonce
+        while True:
+            if lanes > 1:
+                found = _search_nonce_range_parallel(midstate, tail, len(prefix), difficulty, nonce, NONCE_CHUNK_SIZE * lanes, lanes)
+            else:
+                found = _search_nonce_range(midstate, tail, len(prefix), difficulty, nonce, NONCE_CHUNK_SIZE)
+            if found >= 0:
+                return found
+            nonce += NONCE_CHUNK_SIZE * lanes
+
+    # Pure-Python fallback: feeds the prefix to a hasher once and appends only the nonce per attempt
+    prefix_hasher = hashlib.sha256(prefix)
+    # Each leading hex zero is half a byte: compare whole zero bytes, then the high nibble of the next byte if odd
+    zero_bytes, odd_nibble = divmod(difficulty, 2)
+    zero_prefix = b'\x00' * zero_bytes
+    nonce = start_nonce
+    while True:
+        hasher = prefix_hasher.copy()
+        hasher.update(str(nonce).encode())
+        digest = hasher.digest()
+        if digest[:zero_bytes] == zero_prefix and not (odd_nibble and digest[zero_bytes] >= 0x10):
+            return nonce
+        nonce += 1
+
+
 # --- Block and Blockchain ---
 
+BLOCK_RECORD_MAGIC = b'BLK1'  # Marks the start of every block record in the block log
+
 class Block: # A single block in the blockchain
 
     def __init__(self, index, previous_hash, transactions, nonce=0):
         self.index = index
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.timestamp = time.time_ns()  # Integer nanoseconds since the epoch; use timestamp_str() for display
         self.transactions = transactions
         self.previous_hash = previous_hash
         self.nonce = nonce
+        # Commits to the transactions once, so the header hashed during Proof-of-Work has a fixed size
+        self.merkle_root = self.calculate_merkle_root()
         # Calculates the initial hash when the block is created
         self.hash = self.calculate_hash()
 
-    def calculate_hash(self): #Calculates block hash using dictionary representation
-        
-        block_dict = {  # Creates a dictionary of the block's data
-            'index': self.index,
-            'timestamp': self.timestamp,
-            'transactions': [tx.to_dict() for tx in self.transactions], # Serializes each transaction within the block
-            'previous_hash': self.previous_hash,
-            'nonce': self.nonce
-        }
-        # Converts the dictionary to a sorted JSON string for consistent hashing
-        block_string = json.dumps(block_dict, sort_keys=True)
-        # Computes the SHA-256 hash
-        return hashlib.sha256(block_string.encode()).hexdigest()
+    def to_record(self): #Serializes the block as one record of the append-only block log
+        fields = [
+            BLOCK_RECORD_MAGIC,
+            struct.pack('>QQ', self.index, self.timestamp),
+            length_prefixed(self.previous_hash.encode()),
+            bytes.fromhex(self.merkle_root),
+            struct.pack('>Q', self.nonce),
+            bytes.fromhex(self.hash),
+            struct.pack('>I', len(self.transactions)),
+        ]
+        fields.extend(length_prefixed(tx.canonical_bytes()) for tx in self.transactions)
+        return b''.join(fields)
+
+    @classmethod
+    def from_record(cls, buf, offset): #Decodes the block record starting at `offset` of buf (bytes or an mmap), keeping the stored hashes so validation can detect tampering
+        if buf[offset:offset + 4] != BLOCK_RECORD_MAGIC:
+            raise ValueError(f"No block record at offset {offset}")
+        index, timestamp = struct.unpack_from('>QQ', buf, offset + 4)
+        previous_hash, offset = read_length_prefixed(buf, offset + 20)
+        merkle_root, nonce, block_hash, tx_count = struct.unpack_from('>32sQ32sI', buf, offset)
+        offset += 76
+        transactions = []
+        for _ in range(tx_count):
+            tx_data, offset = read_length_prefixed(buf, offset)
+            transactions.append(Transaction.from_canonical_bytes(tx_data))
+
+        # Bypasses __init__, which would recompute the Merkle root and hash instead of using the stored ones
+        block = cls.__new__(cls)
+        block.index = index
+        block.timestamp = timestamp
+        block.transactions = transactions
+        block.previous_hash = previous_hash.decode()
+        block.nonce = nonce
+        block.merkle_root = merkle_root.hex()
+        block.hash = block_hash.hex()
+        return block
+
+    def timestamp_str(self): #Returns the block's timestamp formatted for display
+        return format_timestamp(self.timestamp)
+
+    def calculate_merkle_root(self, from_fields=False): #Calculates the Merkle root (hex) of the block's transaction hashes, in block order
+        # Cached digests are reused when building a block; validation passes from_fields=True so edited transactions are re-hashed
+        if from_fields:
+            return merkle_root([tx.calculate_digest() for tx in self.transactions]).hex()
+        return merkle_root([tx.get_digest() for tx in self.transactions]).hex()
+
+    def header_bytes(self): #Serializes every block field except the nonce, which is appended separately as ASCII digits when hashing
+        return b''.join([
+            struct.pack('>IQ', self.index, self.timestamp),
+            length_prefixed(self.previous_hash.encode()),
+            bytes.fromhex(self.merkle_root),
+        ])
+
+    def calculate_digest(self): #Calculates the raw block hash bytes as SHA-256(serialized block fields + ASCII nonce)
+        return fast_sha256(self.header_bytes() + str(self.nonce).encode())
+
+    def calculate_hash(self): #Calculates the block hash as a hex string
+        return self.calculate_digest().hex()
 
     def __repr__(self):
         # Human-readable representation of the block
         return f"Block(Index: {self.index}, Hash: {self.hash[:8]}..., Prev Hash: {self.previous_hash[:8]}..., Transactions: {len(self.transactions)})"
 
+UTXO_COMMITMENT_MODULUS = 1 << 256  # The UTXO-set commitment is the sum of every unspent UTXO's digest modulo 2^256
+
 class Blockchain: #The main blockchain class
     
     def __init__(self):
         
         self.pending_transactions = []   # A list to hold transactions waiting to be mined
         self.utxo_set = {}    # A dictionary to store all unspent transaction outputs
+        self.utxos_by_address = {}  # Maps each address to the keys of the UTXOs it owns
+        # Order-independent commitment to the UTXO set, updated by add_utxo/spend_utxo so it never needs a full rescan
+        self._utxo_commitment = 0
+        self._validated_up_to = 0   # Index of the last block validate_chain has checked (the genesis block needs no check)
         self.difficulty = 4 # The number of leading zeros required for a valid block hash
         self.chain = []   # The list of blocks that make up the blockchain
         self.block_data_dir = "blockchain_data" # The directory where blocks are saved to disk
+        self.chain_path = os.path.join(self.block_data_dir, "chain.bin") # Append-only log of block records
+        self.index_path = os.path.join(self.block_data_dir, "chain.idx") # Byte offset of each block record in the log, as big-endian uint64s
         
         # Creates data directory if it doesn't exist
         if not os.path.exists(self.block_data_dir):
             os.makedirs(self.block_data_dir)
 
-        # Loads any existing blocks from storage
+        # Loads any existing blocks from storage, and rebuilds the UTXO set they produce
         self.load_chain()
+        for block in self.chain:
+            self.apply_block(block)
 
         # Creates the first block (the genesis block) if the chain is empty
         if not self.chain:
@@ -152,25 +700,45 @@ class Blockchain: #The main blockchain class
         self.save_block(genesis_block)
         print("✅ Genesis Block created.")
 
-    def save_block(self, block): #Adds on a block to a file
-        # Creates a file path using the block's index
-        filepath = os.path.join(self.block_data_dir, f"block_{block.index}.pickle")
-        # Uses the pickle library to serialize the block object and save it to the file
-        with open(filepath, "wb") as f:
-            pickle.dump(block, f)
+    def save_block(self, block): #Appends a block to the block log and records its offset in the index
+        # Append mode starts at the end of the file, so tell() is where this record begins
+        with open(self.chain_path, "ab") as f:
+            offset = f.tell()
+            f.write(block.to_record())
+        # The index is written second, so a record is only loaded once it has been fully written
+        with open(self.index_path, "ab") as f:
+            f.write(struct.pack('>Q', offset))
 
     def load_chain(self): #Loads the blockchain from persistent storage
-        # Finds all files that match the pattern "block_*.pickle"
-        # It's sorted to ensure the blocks are loaded in the correct order
-        block_files = sorted(glob.glob(os.path.join(self.block_data_dir, "block_*.pickle")), 
-                             key=lambda x: int(os.path.basename(x).split('_')[1].split('.')[0]))
         self.chain = []
-        if block_files:
-            for filepath in block_files:
-                # Loads the pickled block object from each file
-                with open(filepath, "rb") as f:
-                    block = pickle.load(f)
-                    self.chain.append(block)
+        if not os.path.exists(self.index_path):
+            return
+        if not os.path.exists(self.chain_path):
+            # An index without its block log points at nothing, so it is discarded and the chain starts afresh
+            print("⚠️ Block log is missing; discarding its index.")
+            os.remove(self.index_path)
+            return
+        with open(self.index_path, "rb") as f:
+            index_data = f.read()
+        # A torn write can leave a partial offset at the end of the index, which is ignored
+        offsets = struct.unpack_from(f'>{len(index_data) // 8}Q', index_data)
+        log_size = os.path.getsize(self.chain_path)
+        if offsets and log_size: # An empty file can't be memory-mapped, and holds no records anyway
+            # Maps the whole log once and decodes each block in place at its recorded offset
+            with open(self.chain_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log:
+                for offset in offsets:
+                    try:
+                        if offset >= log_size:
+                            raise ValueError(f"Block record offset {offset} is past the end of the log")
+                        self.chain.append(Block.from_record(log, offset))
+                    except (ValueError, struct.error) as e: # A torn or corrupt record ends the chain
+                        print(f"⚠️ Stopped loading at block {len(self.chain)}: {e}")
+                        break
+        # Trims the index to the records that loaded, so later appends stay aligned with the log
+        if len(index_data) != len(self.chain) * 8:
+            with open(self.index_path, "r+b") as f:
+                f.truncate(len(self.chain) * 8)
+        if self.chain:
             print(f"Loaded {len(self.chain)} blocks from storage.")
 
     def get_last_block(self): #Returns the last block in the chain
@@ -189,10 +757,15 @@ class Blockchain: #The main blockchain class
         print("⛏️ Starting mining process...")
 
         # Creates a special coinbase transaction to reward the miner
-        coinbase_tx = Transaction(sender_address="blockchain_reward", recipient_address=miner_address, amount=100.0)
+        coinbase_tx = Transaction(sender_address=COINBASE_SENDER, recipient_address=miner_address, amount=100.0)
         
-        # The block will contain the coinbase transaction plus all pending transactions
-        block_transactions = [coinbase_tx] + self.pending_transactions
+        # Re-validates the mempool as one batch, dropping transactions that conflict with each other
+        valid_transactions = self.validate_transactions_batch(self.pending_transactions)
+        if len(valid_transactions) < len(self.pending_transactions):
+            print(f"⚠️ Dropped {len(self.pending_transactions) - len(valid_transactions)} invalid pending transaction(s).")
+
+        # The block will contain the coinbase transaction plus all valid pending transactions
+        block_transactions = [coinbase_tx] + valid_transactions
         
         last_block = self.get_last_block()
         new_block = Block(
@@ -201,21 +774,13 @@ class Blockchain: #The main blockchain class
             transactions=block_transactions,
         )
 
-        # Proof-of-Work: Iterates the nonce until the block's hash meets the difficulty target
-        while new_block.hash[:self.difficulty] != '0' * self.difficulty:
-            new_block.nonce += 1
-            new_block.hash = new_block.calculate_hash()
+        # Proof-of-Work: Searches for a nonce whose block hash meets the difficulty target
+        # Only the nonce changes between attempts, so the rest of the block is serialized once
+        new_block.nonce = find_nonce(new_block.header_bytes(), self.difficulty, new_block.nonce)
+        new_block.hash = new_block.calculate_hash()
 
         # Updates the UTXO set based on the transactions in the newly mined block
-        for tx in block_transactions:
-            # For non-coinbase transactions, remove the spent UTXOs from the set
-            if tx.sender_address != "blockchain_reward":
-                for utxo_in in tx.input_utxos:
-                    self.utxo_set.pop((utxo_in['tx_id'], utxo_in['output_index']), None)
-            
-            # Creates a new UTXO for the transaction's recipient and add it to the set
-            utxo_out = UTXO(tx.id, 0, tx.amount, tx.recipient_address)
-            self.utxo_set[(utxo_out.tx_id, utxo_out.output_index)] = utxo_out
+        self.apply_block(new_block)
 
         # Clears the pending transactions because they are now in a block
         self.pending_transactions = []
@@ -224,9 +789,45 @@ class Blockchain: #The main blockchain class
         print(f"✅ Block #{new_block.index} mined successfully with nonce: {new_block.nonce}")
         return new_block
 
-    def validate_chain(self): #Validates the integrity of the entire blockchain
-        # Iterates through the blocks, starting from the second block (index 1)
-        for i in range(1, len(self.chain)):
+    def apply_block(self, block): #Updates the UTXO set with the outputs a block spends and creates
+        for tx in block.transactions:
+            # For non-coinbase transactions, remove the spent UTXOs from the set
+            if tx.sender_address != COINBASE_SENDER:
+                for utxo_in in tx.input_utxos:
+                    self.spend_utxo((utxo_in['tx_id'], utxo_in['output_index']))
+            
+            # Creates a new UTXO for the transaction's recipient and add it to the set
+            self.add_utxo(UTXO(tx.id, 0, tx.amount, tx.recipient_address))
+
+    def add_utxo(self, utxo): #Adds a UTXO to the set and to its owner's entry in the per-address index
+        utxo_key = (utxo.tx_id, utxo.output_index)
+        self.utxo_set[utxo_key] = utxo
+        self.utxos_by_address.setdefault(utxo.recipient_address, set()).add(utxo_key)
+        self._utxo_commitment = (self._utxo_commitment + int.from_bytes(utxo.get_digest(), 'big')) % UTXO_COMMITMENT_MODULUS
+
+    def spend_utxo(self, utxo_key): #Removes a UTXO from the set and from its owner's entry in the per-address index
+        utxo = self.utxo_set.pop(utxo_key, None)
+        if utxo is not None:
+            self._utxo_commitment = (self._utxo_commitment - int.from_bytes(utxo.get_digest(), 'big')) % UTXO_COMMITMENT_MODULUS
+            owned = self.utxos_by_address[utxo.recipient_address]
+            owned.discard(utxo_key)
+            if not owned: # Drops addresses that no longer own anything
+                del self.utxos_by_address[utxo.recipient_address]
+
+    def calculate_utxo_commitment(self): #Replays every block's UTXO updates from genesis and returns the commitment of the resulting UTXO set
+        unspent_digests = {}
+        for block in self.chain:
+            for tx in block.transactions:
+                if tx.sender_address != COINBASE_SENDER:
+                    for utxo_in in tx.input_utxos:
+                        unspent_digests.pop((utxo_in['tx_id'], utxo_in['output_index']), None)
+                unspent_digests[(tx.id, 0)] = UTXO(tx.id, 0, tx.amount, tx.recipient_address).get_digest()
+        return sum(int.from_bytes(digest, 'big') for digest in unspent_digests.values()) % UTXO_COMMITMENT_MODULUS
+
+    def validate_chain(self, full_audit=False): #Validates the blocks appended since the last check, or the entire blockchain and UTXO set when full_audit is True
+        # Iterates through the blocks, starting from the second block (index 1) or the first one not yet validated
+        start = 1 if full_audit else self._validated_up_to + 1
+        for i in range(start, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i-1]
 
@@ -235,19 +836,34 @@ class Blockchain: #The main blockchain class
                 print(f"❌ Block {current_block.index} hash is invalid!")
                 return False
 
+            # The hash only covers the Merkle root, so checks that the root still matches the block's transactions
+            if current_block.merkle_root != current_block.calculate_merkle_root(from_fields=True):
+                print(f"❌ Block {current_block.index} Merkle root does not match its transactions!")
+                return False
+
             # Check if the current block's previous hash points to the hash of the actual previous block
             if current_block.previous_hash != previous_block.hash:
                 print(f"❌ Block {current_block.index} previous hash link is broken!")
                 return False
-        
+
+        if full_audit:
+            # Recommits to the UTXOs actually held, so edits made to utxo_set outside add_utxo/spend_utxo are caught
+            held_commitment = sum(int.from_bytes(utxo.get_digest(), 'big') for utxo in self.utxo_set.values()) % UTXO_COMMITMENT_MODULUS
+            if held_commitment != self._utxo_commitment:
+                print("❌ UTXO set was modified outside of block processing!")
+                return False
+            # Checks that the held UTXO set is the one the chain produces when replayed from genesis
+            if held_commitment != self.calculate_utxo_commitment():
+                print("❌ UTXO set does not match the blockchain!")
+                return False
+
+        self._validated_up_to = len(self.chain) - 1
         print("✅ Blockchain integrity check passed.")
         return True
 
-    def validate_transaction(self, transaction): #Validates a transaction, including double-spend prevention
-        wallet_manager = Wallet()
-
-        if transaction.sender_address != "blockchain_reward" and not wallet_manager.verify_signature( # Checks for signature validity
-            transaction.sender_address, transaction.signature, json.dumps(transaction.to_dict(), sort_keys=True)
+    def validate_transaction(self, transaction, spent_in_batch=None): #Validates a transaction, including double-spend prevention (spent_in_batch holds UTXOs already claimed by other transactions in the same batch)
+        if transaction.sender_address != COINBASE_SENDER and not Wallet.verify_signature( # Checks for signature validity
+            transaction.sender_address, transaction.signature, transaction.build_signing_payload() # Rebuilt, so in-place edits to the inputs can't hide behind the cache
         ):
             print("❌ Transaction signature is invalid.")
             return False
@@ -267,6 +883,11 @@ class Blockchain: #The main blockchain class
             if utxo_key in consumed_utxos:
                 print("❌ Transaction attempts to spend the same UTXO multiple times.")
                 return False
+
+            # Checks if an earlier transaction in the same batch already spends this UTXO
+            if spent_in_batch is not None and utxo_key in spent_in_batch:
+                print("❌ UTXO is already spent by another transaction in this batch.")
+                return False
             
             consumed_utxos.add(utxo_key)
             total_input_amount += self.utxo_set[utxo_key].amount
@@ -275,15 +896,27 @@ class Blockchain: #The main blockchain class
         if total_input_amount < transaction.amount:
             print("❌ Insufficient funds in UTXOs to cover transaction amount.")
             return False
-        
+
+        # Only a valid transaction claims its inputs for the rest of the batch
+        if spent_in_batch is not None:
+            spent_in_batch.update(consumed_utxos)
         return True
+
+    def validate_transactions_batch(self, transactions): #Validates a batch of transactions together, returning the ones that can be included in one block
+        # Sender public keys are parsed once and shared through Wallet.load_public_key's cache,
+        # and all verifications run on coincurve's shared libsecp256k1 context.
+        # Signatures are still verified one by one: verification only handles public data, so libsecp256k1 inverts s with
+        # its variable-time secp256k1_scalar_inverse_var, a small fraction of a verify next to the two-point multiplication,
+        # and it exposes no hook for sharing inversions (Montgomery's trick) across a batch
+        spent_in_batch = set()
+        return [tx for tx in transactions if self.validate_transaction(tx, spent_in_batch)]
     
+    def get_utxos(self, address): #Returns the UTXOs owned by an address, looked up through the per-address index
+        return [self.utxo_set[utxo_key] for utxo_key in self.utxos_by_address.get(address, ())]
+
     def get_balance(self, address): #Calculates the balance for a given address based on the UTXO set
-        balance = 0
-        for utxo_key, utxo in self.utxo_set.items(): # Iterates through all UTXOs in the global set
-            if utxo.recipient_address == address: # If the UTXO belongs to the specified address, add its amount to the balance
-                balance += utxo.amount
-        return balance
+        # Only visits the UTXOs the address owns, instead of every UTXO in the set
+        return sum(utxo.amount for utxo in self.get_utxos(address))
 
 # --- Main CLI ---
 
@@ -306,7 +939,7 @@ def main():
         if choice == '1':
             wallet_name = input("Enter wallet name: ")
             wallets[wallet_name] = Wallet()
-            print(f"🎉 New wallet '{wallet_name}' created. Address: {wallets[wallet_name].address}")
+            print(f"🎉 New wallet '{wallet_name}' created. Address: {wallets[wallet_name].address.hex()}")
         
         elif choice == '2':
             if len(wallets) < 2:
@@ -325,7 +958,7 @@ def main():
             recipient_wallet = wallets[recipient_name]
 
             # Find UTXOs for the sender
-            sender_utxos = [utxo.to_dict() for utxo in blockchain.utxo_set.values() if utxo.recipient_address == sender_wallet.address]
+            sender_utxos = [utxo.to_dict() for utxo in blockchain.get_utxos(sender_wallet.address)]
             total_available = sum(utxo['amount'] for utxo in sender_utxos)
 
             if total_available < amount:
@@ -336,7 +969,7 @@ def main():
             tx = Transaction(sender_wallet.address, recipient_wallet.address, amount, input_utxos=sender_utxos)
             
             # Sign the transaction
-            tx.signature = sender_wallet.sign_transaction(json.dumps(tx.to_dict(), sort_keys=True))
+            tx.set_signature(sender_wallet.sign_bytes(tx.signing_payload()))
             
             blockchain.add_transaction(tx)
 
@@ -352,7 +985,7 @@ def main():
             print("\n--- Blockchain Contents ---")
             for block in blockchain.chain:
                 print(f"Block #{block.index}")
-                print(f"  Timestamp: {block.timestamp}")
+                print(f"  Timestamp: {block.timestamp_str()}")
                 print(f"  Hash: {block.hash}")
                 print(f"  Previous Hash: {block.previous_hash}")
                 print(f"  Nonce: {block.nonce}")
@@ -374,10 +1007,14 @@ def main():
             if address_or_name in wallets:
                 address_to_check = wallets[address_or_name].address
             else:
-                address_to_check = address_or_name
+                try: # Addresses are typed in hex but stored as raw bytes
+                    address_to_check = bytes.fromhex(address_or_name)
+                except ValueError:
+                    print("❌ Invalid wallet name or address.")
+                    continue
             
             balance = blockchain.get_balance(address_to_check)
-            print(f"💰 Balance for {address_to_check[:8]}... is: {balance}")
+            print(f"💰 Balance for {address_to_check.hex()[:8]}... is: {balance}")
 
         elif choice == '7':
             print("Exiting.")